@@ -9,19 +9,35 @@ Usage:
 import argparse
 import csv
 import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
 from datetime import datetime
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 # Linear CSV column headers
-LINEAR_HEADERS = [
+LINEAR_HEADERS = (
     "ID", "Team", "Title", "Description", "Status", "Estimate", "Priority",
     "Project ID", "Project", "Creator", "Assignee", "Labels", "Cycle Number",
     "Cycle Name", "Cycle Start", "Cycle End", "Created", "Updated", "Started",
     "Triaged", "Completed", "Canceled", "Archived", "Due Date", "Parent issue",
     "Initiatives", "Project Milestone ID", "Project Milestone", "SLA Status", "Roadmaps"
-]
+)
 
 # Status mapping from Height status IDs to Linear status names
 STATUS_MAP = {
@@ -45,23 +61,100 @@ STATUS_MAP = {
     "4e1f732d-5694-4af4-befb-487d982c66da": "Todo",
 }
 
+# Height field template IDs used for the Priority field
+_PRIORITY_FIELD_IDS = frozenset({
+    "e5b1cb21-c337-4511-903b-861ed1cc9ae5",
+    "b88e01b3-3028-47f1-8076-e6967fc31710",
+})
+
+# Marker left in descriptions by the Unito GitLab sync
+_UNITO_MARKER = "┆Task is synchronized with this Gitlab issue by Unito"
+
+# Whitespace (other than the newline itself) at the end of a line
+_TRAILING_WS_RE = re.compile(r'[^\S\n]+(?=\n)')
+
+# English day/month names for Linear dates (independent of the current locale)
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+_WDAYS = ("Sat", "Sun", "Mon", "Tue", "Wed", "Thu", "Fri")
+_DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+# Lengths of "YYYY-MM-DDTHH:MM:SSZ", with no, millisecond or microsecond fractions
+_FAST_ISO_LENGTHS = (20, 24, 27)
+
+# Tasks sent to a worker process at a time
+TRANSFORM_CHUNK_SIZE = 512
+
+# Transformer used inside worker processes, set by _init_transform_worker()
+_TRANSFORMER: Optional[Callable[[Dict], Tuple[str, ...]]] = None
+
 
 def load_json_file(file_path: Path) -> List[Dict[str, Any]]:
-    """Load and parse a JSON file."""
+    """Load and parse a JSON file (using orjson if installed)."""
+    if orjson is not None:
+        return orjson.loads(file_path.read_bytes())
+
     with open(file_path, 'r', encoding='utf-8') as f:
         return json.load(f)
 
 
+def iter_json_array(file_path: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over the items of a top-level JSON array.
+
+    Uses ijson (if installed) to parse incrementally so only one item is held
+    in memory at a time; otherwise falls back to loading the whole file.
+    """
+    if ijson is None:
+        yield from load_json_file(file_path)
+        return
+
+    with open(file_path, 'rb') as f:
+        yield from ijson.items(f, 'item')
+
+
+def _is_ascii_digits(text: str) -> bool:
+    """Check that text consists only of the characters 0-9."""
+    return text.isascii() and text.isdigit()
+
+
 def convert_iso_to_linear_date(iso_date: Optional[str]) -> str:
     """
     Convert ISO 8601 date to Linear's expected format.
 
     Example: "2025-01-08T10:17:10.439Z" -> "Wed Jan 08 2025 10:17:10 GMT+0000 (GMT)"
     """
-    if not iso_date:
+    if not iso_date or not isinstance(iso_date, str):
         return ""
 
+    return _format_linear_date(iso_date)
+
+
+@lru_cache(maxsize=4096)
+def _format_linear_date(iso_date: str) -> str:
+    """Format a non-empty ISO 8601 string as a Linear date (cached, as timestamps repeat)."""
     try:
+        # Fast path for Height's fixed "YYYY-MM-DDTHH:MM:SS[.fff]Z" timestamps
+        if (len(iso_date) in _FAST_ISO_LENGTHS and iso_date[-1] == 'Z'
+                and iso_date[4] == '-' and iso_date[7] == '-' and iso_date[10] == 'T'
+                and iso_date[13] == ':' and iso_date[16] == ':'
+                and (len(iso_date) == 20 or iso_date[19] == '.')
+                and _is_ascii_digits(iso_date[0:4] + iso_date[5:7] + iso_date[8:10] + iso_date[11:13]
+                                     + iso_date[14:16] + iso_date[17:19] + iso_date[20:-1])):
+            year = int(iso_date[0:4])
+            month = int(iso_date[5:7])
+            day = int(iso_date[8:10])
+            hour = int(iso_date[11:13])
+            minute = int(iso_date[14:16])
+            second = int(iso_date[17:19])
+            leap = year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+            if (year >= 1 and 1 <= month <= 12 and 1 <= day <= _DAYS_IN_MONTH[month - 1] + (month == 2 and leap)
+                    and hour < 24 and minute < 60 and second < 60):
+                # Zeller's congruence (0 = Saturday), March-based year
+                m = month + 12 if month < 3 else month
+                y = year - 1 if month < 3 else year
+                weekday = (day + 13 * (m + 1) // 5 + y + y // 4 - y // 100 + y // 400) % 7
+                return f"{_WDAYS[weekday]} {_MONTHS[month - 1]} {iso_date[8:10]} {iso_date[0:4]} {iso_date[11:19]} GMT+0000 (GMT)"
+
         dt = datetime.fromisoformat(iso_date.replace('Z', '+00:00'))
         # Format: "Fri Mar 17 2023 21:33:58 GMT+0000 (GMT)"
         return dt.strftime("%a %b %d %Y %H:%M:%S GMT+0000 (GMT)")
@@ -69,8 +162,15 @@ def convert_iso_to_linear_date(iso_date: Optional[str]) -> str:
         return ""
 
 
-def build_mappings(tasks: List[Dict], teams: List[Dict], users: List[Dict]) -> Dict[str, Dict]:
-    """Build lookup dictionaries for IDs."""
+def build_mappings_and_parents(
+    tasks: Iterable[Dict], teams: Iterable[Dict], users: Iterable[Dict]
+) -> Tuple[Dict[str, Dict], Dict[str, str]]:
+    """
+    Build lookup dictionaries for IDs and the Height parent mapping.
+
+    Tasks are read in a single pass; only (child, parent UUID) pairs are kept
+    until every task ID is known and the parents can be resolved.
+    """
 
     # Map team ID -> team name
     team_map = {team['id']: team['name'] for team in teams}
@@ -81,14 +181,29 @@ def build_mappings(tasks: List[Dict], teams: List[Dict], users: List[Dict]) -> D
         if 'email' in user:
             user_map[user['id']] = user['email']
 
-    # Map task UUID -> T-{index}
-    task_id_to_index = {task['id']: f"T-{task['index']}" for task in tasks}
+    # Map task UUID -> T-{index}, remembering which tasks have a parent
+    task_id_to_index = {}
+    child_parents = []
+    for task in tasks:
+        height_id = f"T-{task['index']}"
+        task_id_to_index[task['id']] = height_id
+        parent_task_id = task.get('parentTaskId')
+        if parent_task_id:
+            child_parents.append((height_id, parent_task_id))
+
+    # Map Height task ID -> parent Height task ID
+    parent_map = {}
+    for height_id, parent_task_id in child_parents:
+        parent_height_id = task_id_to_index.get(parent_task_id, '')
+        if parent_height_id:
+            parent_map[height_id] = parent_height_id
 
-    return {
+    mappings = {
         'teams': team_map,
         'users': user_map,
         'task_ids': task_id_to_index
     }
+    return mappings, parent_map
 
 
 def clean_description(description: str) -> str:
@@ -97,134 +212,181 @@ def clean_description(description: str) -> str:
         return ""
 
     # Remove specific markers that were added during import
-    description = description.replace("┆Task is synchronized with this Gitlab issue by Unito", "")
+    if _UNITO_MARKER in description:
+        description = description.replace(_UNITO_MARKER, "")
 
-    # Clean up excessive newlines
-    lines = [line.rstrip() for line in description.split('\n')]
-    return '\n'.join(lines).strip()
+    # Strip trailing whitespace from each line
+    return _TRAILING_WS_RE.sub("", description).strip()
+
+
+def _is_before(first: str, second: str) -> bool:
+    """Check whether ISO 8601 timestamp first is earlier than second."""
+    # UTC timestamps of the same shape sort lexicographically; anything else
+    # (mixed fraction lengths, offsets) is compared as datetimes
+    if (isinstance(first, str) and isinstance(second, str) and len(first) == len(second)
+            and first.endswith('Z') and second.endswith('Z')):
+        return first < second
+
+    try:
+        first_dt = datetime.fromisoformat(first.replace('Z', '+00:00'))
+        second_dt = datetime.fromisoformat(second.replace('Z', '+00:00'))
+        return first_dt < second_dt
+    except (ValueError, AttributeError, TypeError):
+        return False
 
 
 def extract_priority(fields: List[Dict]) -> str:
     """Extract priority value from task fields."""
     for field in fields:
-        if field.get('name') == 'Priority' or field.get('fieldTemplateId') in [
-            'e5b1cb21-c337-4511-903b-861ed1cc9ae5',
-            'b88e01b3-3028-47f1-8076-e6967fc31710'
-        ]:
-            label = field.get('label') or field.get('selectValue')
+        field_get = field.get
+        if field_get('name') == 'Priority' or field_get('fieldTemplateId') in _PRIORITY_FIELD_IDS:
+            label = field_get('label') or field_get('selectValue')
             if label:
                 return label.get('value', '')
     return ""
 
 
-def transform_task(task: Dict, mappings: Dict, use_height_ids: bool = False) -> Dict[str, str]:
-    """Transform a Height task to Linear CSV row format."""
-
-    # Get team names
-    team_names = [mappings['teams'].get(team_id, '') for team_id in task.get('teamIds', [])]
-    team = team_names[0] if team_names else ""
+def make_transformer(mappings: Dict, use_height_ids: bool = False) -> Callable[[Dict], Tuple[str, ...]]:
+    """
+    Build a function that transforms a Height task to a Linear CSV row.
 
-    # Get creator email
-    creator_id = task.get('createdUserId', '')
-    creator = mappings['users'].get(creator_id, '')
+    The lookups that are the same for every task are bound once here, so the
+    returned function only does per-task work. Rows are ordered as LINEAR_HEADERS.
+    """
+    team_get = mappings['teams'].get
+    user_get = mappings['users'].get
+    task_id_get = mappings['task_ids'].get
+    status_get = STATUS_MAP.get
+    fmt_date = convert_iso_to_linear_date
 
-    # Get assignee emails
-    assignee_ids = task.get('assigneesIds', [])
-    assignee = mappings['users'].get(assignee_ids[0], '') if assignee_ids else ""
+    def transform(task: Dict) -> Tuple[str, ...]:
+        task_get = task.get
 
-    # Get parent task reference
-    parent_task_id = task.get('parentTaskId')
-    parent_issue = mappings['task_ids'].get(parent_task_id, '') if parent_task_id else ""
+        # Get team name (first team only)
+        team_ids = task_get('teamIds', [])
+        team = team_get(team_ids[0], '') if team_ids else ""
 
-    # Extract priority
-    priority = extract_priority(task.get('fields', []))
+        # Get creator email
+        creator_id = task_get('createdUserId', '')
+        creator = user_get(creator_id, '')
 
-    # Map status
-    status = STATUS_MAP.get(task.get('status', ''), task.get('status', ''))
+        # Get assignee emails
+        assignee_ids = task_get('assigneesIds', [])
+        assignee = user_get(assignee_ids[0], '') if assignee_ids else ""
 
-    # Fix status if task has completedAt date (Linear requirement)
-    # If a task has a completion date, it must be in "Done" status
-    if task.get('completedAt'):
-        status = "Done"
+        # Get parent task reference
+        parent_task_id = task_get('parentTaskId')
+        parent_issue = task_id_get(parent_task_id, '') if parent_task_id else ""
 
-    # Get title (no truncation)
-    title = task.get('name', '')
+        # Extract priority
+        priority = extract_priority(task_get('fields', []))
 
-    # Clean and enhance description
-    description = clean_description(task.get('description', ''))
-    height_id = f"T-{task['index']}"
+        # Map status
+        raw_status = task_get('status', '')
+        status = status_get(raw_status, raw_status)
 
-    # Add Height ID reference to description
-    if description:
-        description = f"[Imported from Height: {height_id}]\n\n{description}"
-    else:
-        description = f"[Imported from Height: {height_id}]"
-
-    # Decide whether to use Height IDs or let Linear auto-generate
-    issue_id = height_id if use_height_ids else ""
-
-    # Fix completion date if it's before creation date
-    completed_at = task.get('completedAt')
-    created_at = task.get('createdAt')
-
-    if completed_at and created_at:
-        try:
-            from datetime import datetime
-            completed_dt = datetime.fromisoformat(completed_at.replace('Z', '+00:00'))
-            created_dt = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-
-            # If completion is before creation, use the updated date instead
-            if completed_dt < created_dt:
-                completed_at = task.get('lastActivityAt', completed_at)
-        except (ValueError, AttributeError):
-            pass
-
-    # Build the row
-    return {
-        "ID": issue_id,
-        "Team": team,
-        "Title": title,
-        "Description": description,
-        "Status": status,
-        "Estimate": "",
-        "Priority": priority,
-        "Project ID": "",
-        "Project": "",
-        "Creator": creator,
-        "Assignee": assignee,
-        "Labels": "",
-        "Cycle Number": "",
-        "Cycle Name": "",
-        "Cycle Start": "",
-        "Cycle End": "",
-        "Created": convert_iso_to_linear_date(task.get('createdAt')),
-        "Updated": convert_iso_to_linear_date(task.get('lastActivityAt')),
-        "Started": convert_iso_to_linear_date(task.get('startedAt')),
-        "Triaged": "",
-        "Completed": convert_iso_to_linear_date(completed_at),
-        "Canceled": "",
-        "Archived": "",
-        "Due Date": "",
-        "Parent issue": parent_issue,
-        "Initiatives": "",
-        "Project Milestone ID": "",
-        "Project Milestone": "",
-        "SLA Status": "",
-        "Roadmaps": ""
-    }
+        # Fix status if task has completedAt date (Linear requirement)
+        # If a task has a completion date, it must be in "Done" status
+        completed_at = task_get('completedAt')
+        if completed_at:
+            status = "Done"
 
+        # Get title (no truncation)
+        title = task_get('name', '')
 
-def generate_parent_mapping(tasks: List[Dict], mappings: Dict) -> Dict[str, str]:
-    """Generate a mapping of Height task IDs to their parent IDs."""
-    parent_map = {}
-    for task in tasks:
+        # Clean and enhance description
+        description = clean_description(task_get('description', ''))
         height_id = f"T-{task['index']}"
-        parent_task_id = task.get('parentTaskId')
-        if parent_task_id:
-            parent_height_id = mappings['task_ids'].get(parent_task_id, '')
-            if parent_height_id:
-                parent_map[height_id] = parent_height_id
-    return parent_map
+
+        # Add Height ID reference to description
+        if description:
+            description = f"[Imported from Height: {height_id}]\n\n{description}"
+        else:
+            description = f"[Imported from Height: {height_id}]"
+
+        # Decide whether to use Height IDs or let Linear auto-generate
+        issue_id = height_id if use_height_ids else ""
+
+        # Fix completion date if it's before creation date
+        created_at = task_get('createdAt')
+
+        # If completion is before creation, use the updated date instead
+        if completed_at and created_at and _is_before(completed_at, created_at):
+            completed_at = task_get('lastActivityAt', completed_at)
+
+        # Build the row (in LINEAR_HEADERS order)
+        return (
+            issue_id,                               # ID
+            team,                                   # Team
+            title,                                  # Title
+            description,                            # Description
+            status,                                 # Status
+            "",                                     # Estimate
+            priority,                               # Priority
+            "",                                     # Project ID
+            "",                                     # Project
+            creator,                                # Creator
+            assignee,                               # Assignee
+            "",                                     # Labels
+            "",                                     # Cycle Number
+            "",                                     # Cycle Name
+            "",                                     # Cycle Start
+            "",                                     # Cycle End
+            fmt_date(created_at),                   # Created
+            fmt_date(task_get('lastActivityAt')),   # Updated
+            fmt_date(task_get('startedAt')),        # Started
+            "",                                     # Triaged
+            fmt_date(completed_at),                 # Completed
+            "",                                     # Canceled
+            "",                                     # Archived
+            "",                                     # Due Date
+            parent_issue,                           # Parent issue
+            "",                                     # Initiatives
+            "",                                     # Project Milestone ID
+            "",                                     # Project Milestone
+            "",                                     # SLA Status
+            "",                                     # Roadmaps
+        )
+
+    return transform
+
+
+def _init_transform_worker(mappings: Dict, use_height_ids: bool) -> None:
+    """Build the transformer once in each worker process."""
+    global _TRANSFORMER
+    _TRANSFORMER = make_transformer(mappings, use_height_ids)
+
+
+def _transform_in_worker(task: Dict) -> Tuple[str, ...]:
+    """Transform a task with the worker's transformer."""
+    return _TRANSFORMER(task)
+
+
+def transform_tasks(
+    tasks: Iterable[Dict], mappings: Dict, use_height_ids: bool = False, workers: int = 1
+) -> Iterator[Tuple[str, ...]]:
+    """
+    Transform Height tasks to Linear CSV rows, preserving task order.
+
+    With more than one worker the transform runs in a process pool. Tasks are
+    submitted a window at a time so a streamed export is never fully in memory.
+    """
+    if workers <= 1:
+        yield from map(make_transformer(mappings, use_height_ids), tasks)
+        return
+
+    tasks = iter(tasks)
+    window_size = TRANSFORM_CHUNK_SIZE * workers * 2
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_transform_worker,
+        initargs=(mappings, use_height_ids)
+    ) as executor:
+        while True:
+            window = list(islice(tasks, window_size))
+            if not window:
+                return
+            yield from executor.map(_transform_in_worker, window, chunksize=TRANSFORM_CHUNK_SIZE)
 
 
 def main():
@@ -253,27 +415,39 @@ def main():
         action='store_true',
         help='Generate both CSV formats: one with empty IDs and one with Height IDs'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=os.cpu_count() or 1,
+        help='Number of worker processes used to transform tasks (default: CPU count, 1 disables multiprocessing)'
+    )
 
     args = parser.parse_args()
 
-    # Load JSON files
+    # Load JSON files (tasks.json is streamed on each pass when ijson is
+    # installed, otherwise it is loaded once and reused)
     print(f"Loading data from {args.input_dir}...")
-    tasks = load_json_file(args.input_dir / 'tasks.json')
+    tasks_file = args.input_dir / 'tasks.json'
+    tasks = load_json_file(tasks_file) if ijson is None else None
     teams = load_json_file(args.input_dir / 'teams.json')
     users = load_json_file(args.input_dir / 'users.json')
 
-    print(f"Loaded {len(tasks)} tasks, {len(teams)} teams, {len(users)} users")
-
     # Build mappings
     print("Building ID mappings...")
-    mappings = build_mappings(tasks, teams, users)
+    mappings, parent_mapping = build_mappings_and_parents(
+        tasks if tasks is not None else iter_json_array(tasks_file), teams, users
+    )
 
-    # Generate parent mapping JSON
-    parent_mapping = generate_parent_mapping(tasks, mappings)
+    print(f"Loaded {len(mappings['task_ids'])} tasks, {len(teams)} teams, {len(users)} users")
+
+    # Write parent mapping JSON
     mapping_file = args.output.parent / 'parent_mapping.json'
     print(f"Writing parent mapping to {mapping_file}...")
-    with open(mapping_file, 'w', encoding='utf-8') as f:
-        json.dump(parent_mapping, f, indent=2)
+    if orjson is not None:
+        mapping_file.write_bytes(orjson.dumps(parent_mapping, option=orjson.OPT_INDENT_2))
+    else:
+        with open(mapping_file, 'w', encoding='utf-8') as f:
+            json.dump(parent_mapping, f, indent=2)
     print(f"✓ Created parent mapping with {len(parent_mapping)} relationships")
 
     # Decide which CSV formats to generate
@@ -286,18 +460,35 @@ def main():
     else:
         formats_to_generate = [(args.output, args.use_height_ids)]
 
-    # Generate CSV files
-    for output_path, use_ids in formats_to_generate:
-        print(f"\nTransforming tasks {'with' if use_ids else 'without'} Height IDs...")
-        rows = [transform_task(task, mappings, use_ids) for task in tasks]
-
+    # Generate all CSV files in a single pass over the tasks. Rows are built
+    # with Height IDs and the ID column is blanked for the standard format.
+    if args.generate_both:
+        print("\nTransforming tasks with and without Height IDs...")
+    else:
+        print(f"\nTransforming tasks {'with' if args.use_height_ids else 'without'} Height IDs...")
+    for output_path, _ in formats_to_generate:
         print(f"Writing to {output_path}...")
-        with open(output_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=LINEAR_HEADERS, quoting=csv.QUOTE_ALL)
-            writer.writeheader()
-            writer.writerows(rows)
 
-        print(f"✓ Successfully created {output_path} with {len(rows)} tasks")
+    row_count = 0
+    with ExitStack() as stack:
+        writers = []
+        for output_path, use_ids in formats_to_generate:
+            f = stack.enter_context(open(output_path, 'w', newline='', encoding='utf-8'))
+            writer = csv.writer(f, quoting=csv.QUOTE_ALL)
+            writer.writerow(LINEAR_HEADERS)
+            writers.append((writer.writerow, use_ids))
+
+        rows = transform_tasks(
+            tasks if tasks is not None else iter_json_array(tasks_file), mappings, True, args.workers
+        )
+        for row in rows:
+            row_without_id = ("",) + row[1:]
+            for writerow, use_ids in writers:
+                writerow(row if use_ids else row_without_id)
+            row_count += 1
+
+    for output_path, _ in formats_to_generate:
+        print(f"✓ Successfully created {output_path} with {row_count} tasks")
 
     # Print usage notes
     print("\n" + "="*70)
@@ -9,7 +9,7 @@ This script:
 4. Updates parent-child relationships via Linear API
 
 Requirements:
-    pip install requests
+    pip install "requests>=2.25" "urllib3>=1.26"
 
 Usage:
     python3 update_parent_relationships.py
@@ -20,11 +20,16 @@ import json
 import os
 import re
 import sys
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from urllib.parse import urljoin
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
 except ImportError:
     print("Error: 'requests' module not found.")
     print("Install it with: pip install requests")
@@ -33,6 +38,98 @@ except ImportError:
 
 LINEAR_API_URL = "https://api.linear.app/graphql"
 
+# Number of issueUpdate mutations sent per request (kept small to stay
+# well within Linear's query complexity limits)
+UPDATE_BATCH_SIZE = 20
+
+# Number of update batches sent concurrently
+MAX_WORKERS = 6
+
+# Number of teams whose issues are fetched concurrently
+FETCH_WORKERS = 6
+
+# Seconds to wait for connecting to / reading from the Linear API
+REQUEST_TIMEOUT = (10, 60)
+
+# Tag added to descriptions by height_to_linear.py
+_HEIGHT_TAG = "[Imported from Height: "
+_HEIGHT_ID_RE = re.compile(r'\\?\[Imported from Height: (T-\d+)\\?\]')
+
+
+TEAMS_QUERY = """
+query Teams($after: String) {
+    teams(first: 250, after: $after) {
+        nodes {
+            id
+            key
+        }
+        pageInfo {
+            hasNextPage
+            endCursor
+        }
+    }
+}
+"""
+
+# Only the fields needed to match issues and check their parent
+ISSUES_QUERY = """
+query Issues($filter: IssueFilter, $after: String) {
+    issues(filter: $filter, first: 250, after: $after, orderBy: updatedAt) {
+        nodes {
+            id
+            identifier
+            description
+            parent {
+                id
+            }
+        }
+        pageInfo {
+            hasNextPage
+            endCursor
+        }
+    }
+}
+"""
+
+UPDATE_ISSUE_MUTATION = """
+mutation UpdateIssue($issueId: String!, $parentId: String!) {
+    issueUpdate(
+        id: $issueId,
+        input: { parentId: $parentId }
+    ) {
+        success
+        issue {
+            id
+            identifier
+            parent {
+                identifier
+            }
+        }
+    }
+}
+"""
+
+
+@lru_cache(maxsize=None)
+def build_batch_update_mutation(size: int) -> str:
+    """Build (once per batch size) a mutation with size aliased issueUpdate calls."""
+    params = []
+    updates = []
+    for i in range(size):
+        params.append(f"$issueId{i}: String!, $parentId{i}: String!")
+        updates.append(f"""
+    update{i}: issueUpdate(
+        id: $issueId{i},
+        input: {{ parentId: $parentId{i} }}
+    ) {{
+        success
+    }}""")
+
+    return f"""
+mutation UpdateIssueParents({", ".join(params)}) {{{"".join(updates)}
+}}
+"""
+
 
 class LinearClient:
     """Simple Linear API client using requests."""
@@ -44,61 +141,83 @@ class LinearClient:
             "Content-Type": "application/json"
         }
 
-    def query(self, query: str, variables: Optional[Dict] = None) -> Dict:
-        """Execute a GraphQL query."""
+        # Reuse connections across requests and back off on rate limiting
+        # (Retry honours Retry-After on 429 responses)
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=8,
+            max_retries=Retry(
+                total=5,
+                backoff_factor=0.5,
+                status_forcelist=[429, 502, 503, 504],
+                allowed_methods=["POST"],
+            )
+        )
+        self.session.mount("https://", adapter)
+
+    def post(self, query: str, variables: Optional[Dict] = None) -> Dict:
+        """Send a GraphQL request and return the raw response body."""
         payload = {"query": query}
         if variables:
             payload["variables"] = variables
 
-        response = requests.post(
-            LINEAR_API_URL,
-            json=payload,
-            headers=self.headers
-        )
+        response = self.session.post(LINEAR_API_URL, json=payload, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
-        data = response.json()
+        return response.json()
+
+    def query(self, query: str, variables: Optional[Dict] = None) -> Dict:
+        """Execute a GraphQL query."""
+        data = self.post(query, variables)
 
         if "errors" in data:
             raise Exception(f"GraphQL errors: {data['errors']}")
 
         return data.get("data", {})
 
+    def get_teams(self) -> List[Dict]:
+        """Fetch all teams."""
+        teams = []
+        has_next_page = True
+        cursor = None
+
+        while has_next_page:
+            result = self.query(TEAMS_QUERY, {"after": cursor})
+            teams_data = result.get("teams", {})
+            teams.extend(teams_data.get("nodes", []))
+
+            page_info = teams_data.get("pageInfo", {})
+            has_next_page = page_info.get("hasNextPage", False)
+            cursor = page_info.get("endCursor")
+
+        return teams
+
     def get_all_issues(self, team_key: Optional[str] = None) -> List[Dict]:
-        """Fetch all issues, optionally filtered by team."""
+        """
+        Fetch all issues, optionally filtered by team.
+
+        Without a team filter, each team's issues are paged through in parallel.
+        """
+        if team_key:
+            return self.get_team_issues(team_key)
+
+        team_keys = [team["key"] for team in self.get_teams()]
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+            team_issues = executor.map(self.get_team_issues, team_keys)
+            return [issue for issues in team_issues for issue in issues]
+
+    def get_team_issues(self, team_key: str) -> List[Dict]:
+        """Fetch all issues for a single team."""
         issues = []
         has_next_page = True
         cursor = None
 
-        # Build filter
-        filter_clause = ""
-        if team_key:
-            filter_clause = f'filter: {{ team: {{ key: {{ eq: "{team_key}" }} }} }}'
+        variables = {"filter": {"team": {"key": {"eq": team_key}}}}
 
         while has_next_page:
-            after_clause = f', after: "{cursor}"' if cursor else ""
-
-            query = f"""
-            query {{
-                issues({filter_clause}, first: 100{after_clause}) {{
-                    nodes {{
-                        id
-                        identifier
-                        title
-                        description
-                        parent {{
-                            id
-                            identifier
-                        }}
-                    }}
-                    pageInfo {{
-                        hasNextPage
-                        endCursor
-                    }}
-                }}
-            }}
-            """
-
-            result = self.query(query)
+            variables["after"] = cursor
+            result = self.query(ISSUES_QUERY, variables)
             issues_data = result.get("issues", {})
             issues.extend(issues_data.get("nodes", []))
 
@@ -110,30 +229,47 @@ class LinearClient:
 
     def update_issue_parent(self, issue_id: str, parent_id: str) -> Dict:
         """Update an issue's parent."""
-        mutation = """
-        mutation UpdateIssue($issueId: String!, $parentId: String!) {
-            issueUpdate(
-                id: $issueId,
-                input: { parentId: $parentId }
-            ) {
-                success
-                issue {
-                    id
-                    identifier
-                    parent {
-                        identifier
-                    }
-                }
-            }
-        }
-        """
-
         variables = {
             "issueId": issue_id,
             "parentId": parent_id
         }
 
-        return self.query(mutation, variables)
+        return self.query(UPDATE_ISSUE_MUTATION, variables)
+
+    def update_issue_parents_batch(self, pairs: List[Tuple[str, str]]) -> List[Dict]:
+        """
+        Update the parents of several issues in a single request.
+
+        Each (issue_id, parent_id) pair becomes an aliased issueUpdate mutation.
+        Returns the issueUpdate results in the same order as pairs. Aliases that
+        failed come back with success False and the GraphQL error message; an
+        exception is raised only if the response has no data at all.
+        """
+        variables = {}
+        for i, (issue_id, parent_id) in enumerate(pairs):
+            variables[f"issueId{i}"] = issue_id
+            variables[f"parentId{i}"] = parent_id
+
+        mutation = build_batch_update_mutation(len(pairs))
+        response = self.post(mutation, variables)
+        result = response.get("data")
+        if not result:
+            raise Exception(f"GraphQL errors: {response.get('errors')}")
+
+        # Map per-mutation errors back to their alias
+        alias_errors = {}
+        for error in response.get("errors", []):
+            path = error.get("path") or [None]
+            alias_errors.setdefault(path[0], []).append(error.get("message", str(error)))
+
+        results = []
+        for i in range(len(pairs)):
+            alias = f"update{i}"
+            if alias in alias_errors:
+                results.append({"success": False, "error": "; ".join(alias_errors[alias])})
+            else:
+                results.append(result.get(alias) or {})
+        return results
 
 
 def extract_height_id(description: str) -> Optional[str]:
@@ -141,13 +277,36 @@ def extract_height_id(description: str) -> Optional[str]:
     if not description:
         return None
 
-    match = re.search(r'\\?\[Imported from Height: (T-\d+)\\?\]', description)
+    # Fast path: literal tag, possibly with Linear's markdown-escaped brackets
+    start = description.find(_HEIGHT_TAG)
+    if start >= 0:
+        start += len(_HEIGHT_TAG)
+        end = description.find("]", start)
+        if end > 0:
+            if description[end - 1] == "\\":
+                end -= 1
+            height_id = description[start:end]
+            number = height_id[2:]
+            if height_id.startswith("T-") and number.isascii() and number.isdigit():
+                return height_id
+
+    match = _HEIGHT_ID_RE.search(description)
     if match:
         return match.group(1)
 
     return None
 
 
+def chunked(items: Iterable, size: int) -> Iterator[List]:
+    """Yield successive lists of at most size items."""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
 def build_height_to_linear_mapping(issues: List[Dict]) -> Dict[str, Dict]:
     """Build mapping of Height IDs to Linear issue data."""
     mapping = {}
@@ -158,7 +317,6 @@ def build_height_to_linear_mapping(issues: List[Dict]) -> Dict[str, Dict]:
             mapping[height_id] = {
                 "linear_id": issue["id"],
                 "linear_identifier": issue["identifier"],
-                "title": issue["title"],
                 "current_parent": issue.get("parent")
             }
 
@@ -242,8 +400,7 @@ def main():
             "child_linear_id": child_data["linear_id"],
             "parent_linear_id": parent_data["linear_id"],
             "child_identifier": child_data["linear_identifier"],
-            "parent_identifier": parent_data["linear_identifier"],
-            "child_title": child_data["title"]
+            "parent_identifier": parent_data["linear_identifier"]
         })
 
     print(f"\n{'='*70}")
@@ -272,23 +429,36 @@ def main():
     success_count = 0
     error_count = 0
 
-    for i, update in enumerate(updates_needed, 1):
-        try:
-            result = client.update_issue_parent(
-                update["child_linear_id"],
-                update["parent_linear_id"]
-            )
-
-            if result.get("issueUpdate", {}).get("success"):
-                success_count += 1
-                print(f"  [{i}/{len(updates_needed)}] ✓ {update['child_identifier']} → {update['parent_identifier']}")
-            else:
-                error_count += 1
-                print(f"  [{i}/{len(updates_needed)}] ✗ Failed: {update['child_identifier']}")
+    i = 0
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {
+            executor.submit(client.update_issue_parents_batch, [
+                (update["child_linear_id"], update["parent_linear_id"])
+                for update in batch
+            ]): batch
+            for batch in chunked(updates_needed, UPDATE_BATCH_SIZE)
+        }
 
-        except Exception as e:
-            error_count += 1
-            print(f"  [{i}/{len(updates_needed)}] ✗ Error: {update['child_identifier']}: {e}")
+        for future in as_completed(futures):
+            batch = futures[future]
+            try:
+                results = future.result()
+            except Exception as e:
+                for update in batch:
+                    i += 1
+                    error_count += 1
+                    print(f"  [{i}/{len(updates_needed)}] ✗ Error: {update['child_identifier']}: {e}")
+                continue
+
+            for update, result in zip(batch, results):
+                i += 1
+                if result.get("success"):
+                    success_count += 1
+                    print(f"  [{i}/{len(updates_needed)}] ✓ {update['child_identifier']} → {update['parent_identifier']}")
+                else:
+                    error_count += 1
+                    error = f": {result['error']}" if result.get("error") else ""
+                    print(f"  [{i}/{len(updates_needed)}] ✗ Failed: {update['child_identifier']}{error}")
 
     # Summary
     print(f"\n{'='*70}")